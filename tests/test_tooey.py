@@ -1,10 +1,16 @@
 import argparse
+import functools
 import io
+import json
 import os
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 import unittest.mock
 
-from tooey import Tooey
+from tooey import Tooey, ChoiceProvider
 
 
 class Argument(object):
@@ -118,6 +124,442 @@ class TestTooey(unittest.TestCase):
 
         del os.environ['FORCE_TOOEY']
 
+    @unittest.mock.patch('builtins.input')
+    def test_loop(self, mocked_input):
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--number', type=int, default=1)
+        parser.add_argument('--flag', action='store_true')
+        parser.add_argument('--append', action='append')
+        parser.add_argument('--defaulted', action='append', default=['x'])
+        parser.add_argument('--required', required=True)
+        parser.add_argument('positional', nargs='+')
+        results = []
+
+        @Tooey(loop=True)
+        def looped():
+            os.environ['FORCE_TOOEY'] = '1'
+            results.append(parser.parse_args())  # note: the same parser is intentionally reused for each run
+            del os.environ['FORCE_TOOEY']
+            return len(results)
+
+        mocked_input.side_effect = ['5', 'y', 'abc', '', 'y1', '', 'req', 'a', 'b', '', 'y',  # first run, then repeat
+                                    '', '', '', '', '', '', 'yes',  # second run (all pre-filled), then repeat
+                                    '7', 'n', 'def', '', 'z', '', 'other', 'c', '', 'n']  # third run, then exit
+        with unittest.mock.patch('sys.stdout', io.StringIO()) as output:
+            self.assertEqual(looped(), 3)
+
+        self.assertEqual([r.number for r in results], [5, 5, 7])
+        self.assertEqual([r.flag for r in results], [True, True, False])
+        self.assertEqual([r.append for r in results], [['abc'], ['abc'], ['def']])
+        self.assertEqual([r.defaulted for r in results], [['x', 'y1'], ['x', 'y1'], ['z']])
+        self.assertEqual([r.required for r in results], ['req', 'req', 'other'])
+        self.assertEqual([r.positional for r in results], [['a', 'b'], ['a', 'b'], ['c']])
+        self.assertIn('leave blank to accept the default value (`5`)', output.getvalue())
+        self.assertIn("leave blank to accept the default value (`['a', 'b']`)", output.getvalue())
+        self.assertNotIn('This argument is required', output.getvalue())
+        self.assertEqual(output.getvalue().count('Required arguments that need to be entered'), 1)  # first run only
+        self.assertEqual(parser.get_default('number'), 1)
+        self.assertEqual(parser.get_default('defaulted'), ['x'])
+        self.assertNotIn('ignore_tooey', [a.dest for a in parser._actions])
+        self.assertIs(argparse.ArgumentParser.parse_args, argparse.ArgumentParser.tooey_original_parse_args)
+
+    @unittest.mock.patch('builtins.input')
+    def test_warm_up(self, mocked_input):
+        warm_up_threads = []
+        input_received = threading.Event()
+
+        def slow_warm_up():
+            input_received.wait(1)  # i.e., this task is still running when the user is entering values
+            time.sleep(0.1)
+            warm_up_threads.append(threading.current_thread())
+
+        def failed_warm_up():
+            raise ConnectionError('Warm-up failed')
+
+        def record_input():
+            input_received.set()
+            return 'abc'
+
+        @Tooey(warm_up=[slow_warm_up])
+        def warmed_up():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--value')
+            args = parser.parse_args()
+            del os.environ['FORCE_TOOEY']
+            return args
+
+        mocked_input.side_effect = record_input
+        self.assertEqual(warmed_up().value, 'abc')
+        self.assertEqual(len(warm_up_threads), 1)
+        self.assertIsNot(warm_up_threads[0], threading.current_thread())
+
+        @Tooey(warm_up=[failed_warm_up])
+        def failed():
+            os.environ['IGNORE_TOOEY'] = '1'  # warm-up tasks are still run when Tooey is not active
+            try:
+                argparse.ArgumentParser().parse_args()
+            finally:
+                del os.environ['IGNORE_TOOEY']
+
+        with self.assertRaises(ConnectionError):
+            failed()
+
+    @unittest.mock.patch('tooey.tooey.termios', None)  # i.e., the fallback used where `select` cannot wait on stdin
+    @unittest.mock.patch('builtins.input')
+    def test_timeout(self, mocked_input):
+        import tooey.tooey
+        outcomes = {}
+        respond = threading.Event()
+
+        def unattended_input():
+            respond.wait(5)
+            return 'late'
+
+        @Tooey(timeout=0.05, argument_timeouts={'required': 0.1})
+        def unattended():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--named', default='default')
+            parser.add_argument('--append', action='append')
+            parser.add_argument('--required', required=True)
+            with unittest.mock.patch.object(parser, 'tooey_original_error', create=True) as mocked_error:
+                mocked_error.side_effect = SystemExit
+                try:
+                    outcomes.update(parser.parse_args().__dict__)
+                finally:
+                    outcomes['error'] = mocked_error.call_args
+                    del os.environ['FORCE_TOOEY']
+
+        mocked_input.side_effect = unattended_input
+        with self.assertRaises(SystemExit):
+            unattended()
+        self.assertIn('--required: no value was entered within 0.1 seconds', outcomes['error'][0][0])
+
+        # the unanswered read is still pending, so its eventual response is used for the next prompt
+        respond.set()
+        self.assertEqual(tooey.tooey.get_input(timeout=1), 'late')
+        self.assertIsNone(tooey.tooey._pending_input)
+
+        respond.clear()
+
+        @Tooey
+        def unattended_optional():
+            os.environ['FORCE_TOOEY'] = '1'
+            os.environ['TOOEY_TIMEOUT'] = '0.05'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--named', default='default')
+            parser.add_argument('--count', action='count')
+            args = parser.parse_args()
+            del os.environ['FORCE_TOOEY']
+            del os.environ['TOOEY_TIMEOUT']
+            return args
+
+        self.assertEqual(unattended_optional(), argparse.Namespace(named='default', count=None))
+        respond.set()
+        self.assertEqual(tooey.tooey.get_input(timeout=1), 'late')
+
+        # values that were appended before a timeout are kept (and satisfy a required argument)
+        @Tooey(timeout=0.3)
+        def partially_attended():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--optional', action='append')
+            parser.add_argument('--required', action='append', required=True)
+            args = parser.parse_args()
+            del os.environ['FORCE_TOOEY']
+            return args
+
+        with unittest.mock.patch('tooey.tooey._get_timed_input') as mocked_timed_input:
+            timed_out = tooey.tooey._PromptTimeout(0.3)
+            mocked_timed_input.side_effect = ['a', timed_out, 'b', timed_out]
+            self.assertEqual(partially_attended(), argparse.Namespace(optional=['a'], required=['b']))
+
+    def test_timeout_pipe(self):
+        import tooey.tooey
+        if not tooey.tooey.termios:
+            self.skipTest('Waiting for input with `select` requires POSIX')
+
+        # no read is left running after a timeout, and nothing beyond the current line is consumed
+        read_file, write_file = os.pipe()
+        with os.fdopen(read_file) as pipe_input, unittest.mock.patch('sys.stdin', pipe_input):
+            with self.assertRaises(tooey.tooey._PromptTimeout):
+                tooey.tooey.get_input(timeout=0.05)
+            os.write(write_file, b'hello\nworld\n')
+            self.assertEqual(tooey.tooey.get_input(timeout=1), 'hello')
+            self.assertEqual(sys.stdin.readline(), 'world\n')
+
+            # untimed prompts do not buffer ahead, so the next line is still available to timed prompts
+            os.write(write_file, b'one\ntwo\n')
+            self.assertEqual(tooey.tooey.get_input(), 'one')
+            self.assertEqual(tooey.tooey.get_input(timeout=1), 'two')
+        os.close(write_file)
+
+        # the scheduled job case - stdin is a pipe that stays open, and the script later reads from it itself
+        script = '\n'.join(['import argparse', 'from tooey import Tooey', '',
+                            "@Tooey(argument_timeouts={'second': 5, 'named': 0.1})", 'def main():',
+                            '    parser = argparse.ArgumentParser()', "    parser.add_argument('--first')",
+                            "    parser.add_argument('--second')",
+                            "    parser.add_argument('--named', default='default')",
+                            '    args = parser.parse_args()',
+                            "    print('parsed', args.first, args.second, args.named, flush=True)",
+                            "    print('read', input(), flush=True)", '', 'main()'])
+        environment = dict(os.environ, FORCE_TOOEY='1',
+                           PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(tooey.tooey.__file__))))
+        process = subprocess.Popen([sys.executable, '-c', script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, env=environment)
+        process.stdin.write(b'one\ntwo\n')  # i.e., untimed and timed prompts, then the unanswered (timed) prompt
+        process.stdin.flush()
+        output = []
+        for line in process.stdout:
+            output.append(line.decode())
+            if line.startswith(b'parsed'):
+                break
+        process.stdin.write(b'hello\n')
+        process.stdin.flush()
+        remaining_output, error_output = process.communicate(timeout=10)
+        output.append(remaining_output.decode())
+        self.assertEqual(process.returncode, 0, error_output.decode())
+        self.assertIn('parsed one two default', ''.join(output))
+        self.assertIn('read hello', ''.join(output))
+
+    @Tooey
+    @unittest.mock.patch('builtins.input')
+    def test_choice_provider(self, mocked_input):
+        os.environ['FORCE_TOOEY'] = '1'
+
+        provider_calls = []
+
+        def provider():
+            provider_calls.append(1)
+            return ['choice-%d' % i for i in range(50)]
+
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--dynamic', action='append', choices=ChoiceProvider(provider, page_size=10))
+        parser.add_argument('--iterable', type=int, choices=ChoiceProvider(iter(range(3))))
+        self.assertEqual(provider_calls, [])  # nothing is evaluated when setting up the parser
+
+        mocked_input.side_effect = ['?', 'choice-15', 'invalid', 'choice-49', '', '2']
+        args = parser.parse_args()
+
+        del os.environ['FORCE_TOOEY']
+
+        self.assertEqual(args.dynamic, ['choice-15', 'choice-49'])
+        self.assertEqual(args.iterable, 2)
+        self.assertEqual(provider_calls, [1])  # choices are cached across prompts and repeated `append` values
+
+        from tooey.tooey import _dynamic_choice_list_string
+        self.assertEqual(_dynamic_choice_list_string(ChoiceProvider(provider, page_size=10), 1),
+                         ' from `%s` (showing 11-20 of 50; enter `?` to see more)' % ', '.join(
+                             ['choice-%d' % i for i in range(10, 20)]))
+        self.assertEqual(provider_calls, [1])
+
+        # one-shot iterables are kept by their provider, so they are unaffected by evictions from the shared cache
+        iterable_provider = ChoiceProvider(iter(['a', 'b']))
+        self.assertIn('b', iterable_provider)
+        for i in range(40):
+            ChoiceProvider(functools.partial(str, i)).get_choices()
+        self.assertEqual(iterable_provider.get_choices(), ('a', 'b'))
+
+    @Tooey
+    @unittest.mock.patch('builtins.input')
+    def test_presets(self, mocked_input):
+        working_directory = os.getcwd()
+
+        with tempfile.TemporaryDirectory() as project_directory, tempfile.TemporaryDirectory() as home_directory:
+            with open(os.path.join(project_directory, 'tooey.ini'), 'w') as project_config:
+                project_config.write('[DEFAULT]\nproject = 1 2\nuser = overridden\n\n[other_script]\ncount = 5\n')
+            with open(os.path.join(home_directory, '.tooey.ini'), 'w') as user_config:
+                user_config.write('[DEFAULT]\nuser = user_value\nflag = yes\ninvalid = abc\nappend = a "b c"\n')
+
+            environment = {'FORCE_TOOEY': '1', 'HOME': home_directory, 'TOOEY_ARG_ENVIRONMENT': '3.5',
+                           'TOOEY_ARG_PROJECT': '3 4'}
+            os.chdir(project_directory)
+            try:
+                with unittest.mock.patch.dict(os.environ, environment):
+                    parser = argparse.ArgumentParser(prog='script')
+                    parser.add_argument('--environment', type=float)
+                    parser.add_argument('--project', nargs=2, type=int)
+                    parser.add_argument('--user')
+                    parser.add_argument('--flag', action='store_true')
+                    parser.add_argument('--append', action='append')
+                    parser.add_argument('--count', action='count')
+                    parser.add_argument('--invalid', type=int)
+                    parser.add_argument('--runtime', default='default')
+
+                    mocked_input.side_effect = ['2', '1']  # only --count and --invalid are prompted
+                    args = parser.parse_args(['--runtime', 'value'])
+            finally:
+                os.chdir(working_directory)
+
+        self.assertEqual(args, argparse.Namespace(environment=3.5, project=[3, 4], user='overridden', flag=True,
+                                                  append=['a', 'b c'], count=2, invalid=1, runtime='value'))
+
+    def test_live_validation(self):
+        from tooey.tooey import _get_live_validator
+
+        parser = argparse.ArgumentParser()
+        choice_action = parser.add_argument('--choice', type=int, choices=range(1, 20))
+        file_action = parser.add_argument('--file', type=argparse.FileType('r'), choices=['/dev/null'])
+        validate = _get_live_validator(choice_action)
+
+        self.assertEqual(validate(''), (True, ''))
+        self.assertEqual(validate('1'), (True, 'matches: 1, 10, 11, 12, 13, 14, 15, 16, 17, 18, ...'))
+        self.assertEqual(validate('x'), (False, 'not a valid `int` value'))
+        self.assertEqual(validate('25'), (False, 'no matching choices'))
+        self.assertEqual(_get_live_validator(file_action)('/dev/zero'), (True, ''))  # only checked on submission
+
+        # values that are incomplete while typing are not highlighted as invalid, but cannot be submitted
+        validate_float = _get_live_validator(parser.add_argument('--float', type=float))
+        for partial_value in ('-', '.', '1e', '1.5e-', 'in'):
+            self.assertEqual(validate_float(partial_value), (True, 'incomplete `float` value'))
+            self.assertFalse(validate_float(partial_value, complete=True)[0])
+        self.assertEqual(validate_float('1e5', complete=True), (True, ''))
+        self.assertEqual(validate_float('1x'), (False, 'not a valid `float` value'))
+        self.assertEqual(validate('-'), (True, 'incomplete `int` value'))
+        self.assertFalse(validate('-', complete=True)[0])
+
+        try:
+            import pty
+            import tty
+        except ImportError:
+            self.skipTest('Live validation requires a POSIX terminal')
+
+        from tooey.tooey import get_input
+        controller, terminal = pty.openpty()
+        tty.setcbreak(terminal)
+        with os.fdopen(terminal) as terminal_input, unittest.mock.patch('sys.stdin', terminal_input):
+            os.write(controller, '25\r\x7f\x7f7\r'.encode())  # the first (invalid) submission is refused
+            self.assertEqual(get_input('Enter a value:', validator=validate), '7')
+        os.close(controller)
+
+    @unittest.mock.patch('builtins.input')
+    def test_form(self, mocked_input):
+        @Tooey(form='group')
+        def form_entry():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--number', type=int)
+            parser.add_argument('--choices', nargs='+', choices=['a', 'b', 'c'])
+            parser.add_argument('--flag', action='store_true')
+            parser.add_argument('--append', action='append')
+            parser.add_argument('--skipped', default='default')
+            parser.add_argument('--required', required=True)
+            parser.add_argument('--runtime')
+            group = parser.add_argument_group('extra')
+            group.add_argument('--extra', nargs=2)
+            args = parser.parse_args(['--runtime', 'value'])
+            del os.environ['FORCE_TOOEY']
+            return args
+
+        mocked_input.side_effect = ['1=abc', 'choices=a b', '--flag=y', 'append=x', 'append=y z', 'unknown', '',
+                                    '4',  # --number is prompted again because its form value is invalid
+                                    'r',  # --required is prompted individually because it was not in the form
+                                    '1 = e1 "e 2"', '']  # the form for the `extra` group
+        self.assertEqual(form_entry(), argparse.Namespace(number=4, choices=['a', 'b'], flag=True,
+                                                          append=['x', 'y z'], skipped='default', required='r',
+                                                          runtime='value', extra=['e1', 'e 2']))
+
+        @Tooey(form=True)
+        def optional_form_entry():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--empty', nargs='?', const='c', default='d')
+            parser.add_argument('--const', nargs='?', const='c', default='d')
+            parser.add_argument('--two', nargs=2)
+            args = parser.parse_args([])
+            del os.environ['FORCE_TOOEY']
+            return args
+
+        # only the invalid --two value (which has too many values) is prompted for again
+        mocked_input.side_effect = ['empty=', 'const', 'two=a b c', '', 'x', 'y']
+        with unittest.mock.patch('sys.stdout', io.StringIO()) as output:
+            self.assertEqual(optional_form_entry(), argparse.Namespace(empty='d', const='c', two=['x', 'y']))
+        self.assertIn('does not contain the required number of values (2)', output.getvalue())
+
+    @unittest.mock.patch('builtins.input')
+    def test_profile(self, mocked_input):
+
+        def profiled_function():
+            time.sleep(0.05)
+            return bytearray(1024 * 1024)
+
+        @Tooey
+        def profiled():
+            os.environ['FORCE_TOOEY'] = '1'
+            parser = argparse.ArgumentParser()
+            parser.add_argument('--value')
+            args = parser.parse_args()
+            del os.environ['FORCE_TOOEY']
+            return args, profiled_function()
+
+        def slow_input():
+            time.sleep(0.1)
+            return 'abc'
+
+        mocked_input.side_effect = slow_input
+        with tempfile.TemporaryDirectory() as output_directory:
+            output_file = os.path.join(output_directory, 'profile.prof')
+            argv = ['script.py', '--tooey-profile', '--tooey-trace-memory', '--tooey-profile-output', output_file]
+            with unittest.mock.patch('sys.argv', argv), unittest.mock.patch('sys.stderr', io.StringIO()) as report:
+                args, _ = profiled()
+            self.assertTrue(os.path.exists(output_file))
+
+        self.assertEqual(args, argparse.Namespace(value='abc'))
+        report = report.getvalue()
+        self.assertIn('Tooey profile report', report)
+        self.assertIn('profiled_function', report)
+        self.assertNotIn('slow_input', report)  # time spent prompting is not profiled
+        self.assertIn('peak memory', report)
+
+        prompt_time = float(report.split('interactive prompting: ')[1].split('s')[0])
+        self.assertGreaterEqual(prompt_time, 0.1)
+
+    @Tooey
+    @unittest.mock.patch('builtins.input')
+    def test_preflight(self, mocked_input):
+        os.environ['FORCE_TOOEY'] = '1'
+
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--number', type=int)
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument('--a')
+        group.add_argument('--b')
+        parser.add_argument('--required', required=True)
+
+        mocked_input.side_effect = ['', 'x', 'y', '', 'value']  # the first value for --b conflicts with --a
+        with unittest.mock.patch('sys.stdout', io.StringIO()) as output:
+            args = parser.parse_args(['--number', 'abc', '--required', 'given'])
+
+        output = output.getvalue()
+        preflight_output = output.split('Argument:')[0]
+        self.assertIn("The arguments provided at runtime are not valid: argument --number: invalid int value: 'abc'",
+                      preflight_output)
+        self.assertIn('Required arguments that need to be entered: --required', preflight_output)
+        self.assertIn('argparse stops parsing after an invalid argument', preflight_output)
+        self.assertNotIn('not valid: the following arguments are required', preflight_output)
+        self.assertNotIn('unrecognized arguments', preflight_output)  # reported by argparse after the invalid value
+        self.assertIn('argument --b: not allowed with argument --a - please enter a different value', output)
+        self.assertEqual(args, argparse.Namespace(number=None, a='x', b=None, required='value'))
+
+        # conflicts between runtime values are reported before prompting, and still lead to an error if interrupted
+        mocked_input.side_effect = [KeyboardInterrupt]
+        with unittest.mock.patch('sys.stdout', io.StringIO()) as output:
+            with unittest.mock.patch('sys.stderr', io.StringIO()):
+                self.assertRaises(SystemExit, parser.parse_args, ['--a', '1', '--b', '2'])
+        self.assertIn('argument --b: not allowed with argument --a', output.getvalue().split('Argument:')[0])
+
+        # argparse keeps all other values when reporting unrecognised arguments
+        mocked_input.side_effect = ['', '', '']
+        with unittest.mock.patch('sys.stdout', io.StringIO()) as output:
+            args = parser.parse_args(['--required', 'given', 'extra'])
+        preflight_output = output.getvalue().split('Argument:')[0]
+        self.assertIn('not valid: unrecognized arguments: extra', preflight_output)
+        self.assertNotIn('argparse stops parsing', preflight_output)
+        self.assertEqual(args, argparse.Namespace(number=None, a=None, b=None, required='given'))
+
+        del os.environ['FORCE_TOOEY']
+
     def test_with_gooey(self):
         # TODO: test the Gooey integration more extensively/effectively
         from gooey import Gooey
@@ -164,6 +606,58 @@ class TestTooey(unittest.TestCase):
         from tooey.tooey import safe_get_namespace_boolean  # just returns false when a key is not found...
         self.assertFalse(safe_get_namespace_boolean([argparse.Namespace()], 'fake_key'))
 
+    def test_schema(self):
+        from tooey.tooey import compile_schema
+
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument('--choices', nargs=2, type=int, choices=range(1, 4), required=True, help='Choices')
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument('--file', type=argparse.FileType('rb'))
+        group.add_argument('--flag', action='store_true')
+
+        schema = compile_schema(parser)
+        choices, file, flag = schema['actions']
+        self.assertEqual(choices['dest'], 'choices')
+        self.assertEqual(choices['type'], 'int')
+        self.assertEqual(choices['nargs'], 2)
+        self.assertEqual(choices['choices'], ['1', '2', '3'])
+        self.assertTrue(choices['required'])
+        self.assertEqual(choices['prompts']['choice_list_string'], ' from `1, 2, 3`')
+        self.assertEqual(file['prompts']['type_string'], ' of type `%s`' % argparse.FileType('rb'))
+        self.assertEqual(file['exclusive_group'], flag['exclusive_group'])
+        self.assertEqual(flag['action'], '_StoreTrueAction')
+        self.assertIsNone(choices['exclusive_group'])
+        self.assertEqual(choices['group'], 'options' if sys.version_info >= (3, 10) else 'optional arguments')
+        self.assertIsNone(schema['key'])  # only calculated when the schema is written to a file
+
+        # long lists of choices are truncated in the schema, and only listed in full when actually prompted
+        parser.add_argument('--many', choices=range(1_000_000))
+        many = compile_schema(parser)['actions'][-1]
+        self.assertEqual(len(many['choices']), 100)
+        self.assertTrue(many['choices_truncated'])
+        self.assertTrue(many['prompts']['choice_list_string'].endswith(', 98, 99, ...`'))
+
+    def test_schema_cache(self):
+        from tooey.tooey import compile_schema
+
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--cached', type=float)
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            schema = compile_schema(parser, cache_directory=cache_directory)
+            cache_file = os.path.join(cache_directory, '%s.json' % schema['key'])
+            self.assertTrue(os.path.exists(cache_file))
+            with open(cache_file) as schema_file:
+                self.assertEqual(json.load(schema_file), schema)
+
+            # schema files are only written for external front ends, and are never read back
+            with open(cache_file, 'w') as schema_file:
+                schema_file.write('{}')
+            self.assertEqual(compile_schema(parser, cache_directory=cache_directory), schema)
+
+            parser.add_argument('--changed')
+            self.assertNotEqual(compile_schema(parser, cache_directory=cache_directory)['key'], schema['key'])
+
     # ------------------------------------------------------------------------------------------------------------------
 
     @unittest.mock.patch('builtins.input')
@@ -1 +1 @@
-from tooey.tooey import Tooey
+from tooey.tooey import Tooey, ChoiceProvider
@@ -3,11 +3,34 @@ Tooey: Gooey, but for TUIs
 Decorate your argparse function with `@Tooey` to be prompted interactively in the terminal to enter each argument
 """
 import argparse
+import codecs
+import collections
+import collections.abc
+import configparser
 import contextlib
 import copy
+import cProfile
 import functools
+import hashlib
+import io
+import itertools
+import json
 import os
+import pstats
+import re
+import shlex
+import shutil
 import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import select
+    import termios
+    import tty
+except ImportError:  # live validation requires a POSIX terminal (i.e., not Windows)
+    termios = None
 
 # noinspection PyUnresolvedReferences,PyProtectedMember
 from argparse import (
@@ -31,12 +54,125 @@ from argparse import (
 _SEPARATOR = '-' * 80
 _YES_CHOICES = ('y', 'yes')
 _YES_CHOICES_STRING = ' / '.join(_YES_CHOICES)
+_NO_CHOICES = ('n', 'no')
+_NO_CHOICES_STRING = ' / '.join(_NO_CHOICES)
 
 _GOOEY_IGNORE_COMMAND = '--ignore-gooey'
 
+# hidden arguments that are added to every parser, and removed again after parsing
+_INTERNAL_ARGUMENTS = (
+    ('--ignore-tooey', {'action': 'store_true'}),
+    ('--force-tooey', {'action': 'store_true'}),
+    ('--tooey-profile', {'action': 'store_true'}),
+    ('--tooey-trace-memory', {'action': 'store_true'}),
+    ('--tooey-profile-output', {'default': None})
+)
+_INTERNAL_ARGUMENT_DESTS = tuple(a[0].lstrip('-').replace('-', '_') for a in _INTERNAL_ARGUMENTS)
+_PROFILE_REPORT_LINES = 25
+
+_TIMEOUT_ENVIRONMENT_VARIABLE = 'TOOEY_TIMEOUT'
+
+_LIVE_VALIDATION_ENVIRONMENT_VARIABLE = 'TOOEY_LIVE_VALIDATION'
+_LIVE_VALIDATION_TYPES = (str, int, float, complex)  # types that are safe to convert on every keystroke
+_LIVE_VALIDATION_PREFIXES = {  # partial input that is not yet a valid value, but could become one when typing continues
+    int: re.compile(r'\s*[+-]?(\d[\d_]*)?'),
+    float: re.compile(r'\s*[+-]?((\d[\d_]*(\.\d*)?|\.\d+)([eE][+-]?)?|\.|i(n(f(i(n(i(ty?)?)?)?)?)?)?|n(an?)?)?',
+                      re.IGNORECASE),
+    complex: re.compile(r'\s*\(?[+-]?[\d_.eE+-]*[jJ]?')
+}
+_LIVE_VALIDATION_CHOICE_LIMIT = 10000  # the maximum number of choices to search for matches on each keystroke
+_LIVE_VALIDATION_MATCHES = 10
+
+_FORM_ENVIRONMENT_VARIABLE = 'TOOEY_FORM'
+_FORM_GROUP_MODE = 'group'
+
+_MORE_CHOICES_COMMAND = '?'
+_CHOICE_CACHE_SIZE = 32
+
+_PRESET_ENVIRONMENT_VARIABLE_PREFIX = 'TOOEY_ARG_'
+_PRESET_PROJECT_CONFIG_FILE = 'tooey.ini'
+_PRESET_USER_CONFIG_FILE = os.path.join('~', '.tooey.ini')
+
+_SCHEMA_VERSION = 2
+_SCHEMA_CHOICE_LIMIT = 100  # longer lists of choices are truncated in the schema, and only fully listed when prompting
+_SCHEMA_CACHE_ENVIRONMENT_VARIABLE = 'TOOEY_SCHEMA_CACHE'
+
+
+_pending_input = None  # see `_get_timed_input`
+_queued_responses = collections.deque()  # see `_get_form_responses`
+_choice_cache = collections.OrderedDict()  # see `ChoiceProvider`
+_config_cache = {}  # see `_get_config_file`
+
+
+class _PromptTimeout(Exception):
+    partial_value = None  # for `append` actions, the values that had been added before the prompt timed out
+
+
+class ChoiceProvider(object):
+    # a lazily-evaluated replacement for an argument's `choices` - the provider (a callable or an iterable) is only used
+    # when the choices are actually needed (i.e., when prompting, or validating a value), rather than when the parser is
+    # created; results from callables are cached for `ttl` seconds, and are shared between all prompts, while iterables
+    # (which may only be usable once) are kept by the provider itself, with at most `page_size` choices shown at once
+    def __init__(self, provider, ttl=60, page_size=20):
+        self.provider = provider
+        self.ttl = ttl
+        self.page_size = page_size
+        self._iterable_choices = None
+
+    def _get_key(self):
+        return self.provider if isinstance(self.provider, collections.abc.Hashable) else id(self.provider)
+
+    def _get_cached_choices(self):
+        if not callable(self.provider):
+            return self._iterable_choices  # never evicted, as the iterable cannot necessarily be read again
+        cached = _choice_cache.get(self._get_key())
+        if cached and cached[0] > time.monotonic():
+            _choice_cache.move_to_end(self._get_key())
+            return cached[1]
+        return None
+
+    def get_choices(self):
+        choices = self._get_cached_choices()
+        if choices is not None:
+            return choices
+
+        if not callable(self.provider):
+            self._iterable_choices = tuple(self.provider)
+            return self._iterable_choices
+
+        choices = tuple(self.provider())
+        _choice_cache[self._get_key()] = (time.monotonic() + self.ttl, choices)
+        while len(_choice_cache) > _CHOICE_CACHE_SIZE:
+            _choice_cache.popitem(last=False)
+        return choices
+
+    def get_page(self, page):
+        choices = self.get_choices()
+        start = (page * self.page_size) % len(choices) if choices else 0
+        return choices[start:start + self.page_size], start, len(choices)
+
+    def __contains__(self, value):
+        return value in self.get_choices()
+
+    def __iter__(self):
+        # argparse only iterates over choices to display them (including when the parser is set up), so we avoid calling
+        # the provider just for this - see `get_choices` for the full list
+        choices = self._get_cached_choices()
+        return iter(choices if choices is not None else ('...',))
+
+    def __bool__(self):
+        return True  # avoid evaluating the provider just to check whether choices are present
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.provider)
+
 
 # noinspection PyPep8Naming
-def Tooey(f=None):
+def Tooey(f=None, loop=False, warm_up=None, timeout=None, argument_timeouts=None, live_validation=False, form=None):
+    if f is None:  # used with arguments - e.g., `@Tooey(loop=True)`
+        return functools.partial(Tooey, loop=loop, warm_up=warm_up, timeout=timeout,
+                                 argument_timeouts=argument_timeouts, live_validation=live_validation, form=form)
+
     global_config = None
     if 'gooey' in sys.modules:
         # when Gooey is present we need to be able to parse arguments earlier in order to disable it if necessary, and
@@ -44,8 +180,7 @@ def Tooey(f=None):
         # note: the need to handle this in the root Tooey definition means that it will be run at launch, before the
         # wrapped function is actually called (and multiple times if there are multiple `@Tooey` decorators used)
         config_parser = argparse.ArgumentParser(add_help=False)
-        config_parser.add_argument('--ignore-tooey', action='store_true')
-        config_parser.add_argument('--force-tooey', action='store_true')
+        _add_internal_arguments(config_parser)
         global_config, remaining_argv = config_parser.parse_known_args()
         global_config.ignore_tooey, global_config.force_tooey = check_environment(global_config.ignore_tooey,
                                                                                   global_config.force_tooey)
@@ -64,24 +199,141 @@ def Tooey(f=None):
         ArgumentParser.tooey_original_error = ArgumentParser.error
         ArgumentParser.tooey_global_config = global_config
 
-        ArgumentParser.parse_args = parse_args
-        ArgumentParser.error = error
+        # session state is shared between all parsers used in (and all repeated runs of) the wrapped function
+        session = _new_session(warm_up, timeout, argument_timeouts, live_validation, form)
+        ArgumentParser.tooey_session = session
 
         if 'gooey' in sys.modules and not global_config.ignore_tooey:  # undo our Gooey modification
             with contextlib.suppress(IndexError):
                 if sys.argv[-1] == _GOOEY_IGNORE_COMMAND:
                     sys.argv.pop()
 
-        result = f(*args, **kwargs)
+        # the profiling options have to be known before the function is called, so we check for them separately here
+        # (they are still added to, and then removed from, the function's own parser to avoid it reporting an error)
+        profile_config = global_config if global_config else _parse_internal_arguments()
+        start_time = time.perf_counter()
+        if profile_config.tooey_profile or profile_config.tooey_profile_output:
+            session.profiler = cProfile.Profile()
+        if profile_config.tooey_trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
 
-        ArgumentParser.parse_args = ArgumentParser.tooey_original_parse_args
-        ArgumentParser.error = ArgumentParser.tooey_original_error
+        try:
+            while True:
+                ArgumentParser.parse_args = parse_args
+                ArgumentParser.error = error
+                try:
+                    if session.profiler:
+                        session.profiler.enable()
+                    result = f(*args, **kwargs)
+                finally:
+                    if session.profiler:
+                        session.profiler.disable()
+                    ArgumentParser.parse_args = ArgumentParser.tooey_original_parse_args
+                    ArgumentParser.error = ArgumentParser.tooey_original_error
 
-        return result
+                # in loop mode we keep the same process (and so any expensive imports or setup) for repeated runs
+                repeat_start_time = time.perf_counter()
+                if not loop or not session.interactive or not _repeat_run(check_timeout_environment(session.timeout)):
+                    return result
+                session.prompt_time += time.perf_counter() - repeat_start_time
+
+                session.interactive = False
+                session.previous_values = session.values
+                session.values = {}
+
+        finally:
+            if session.profiler or profile_config.tooey_trace_memory:
+                _write_profile_report(profile_config, session, time.perf_counter() - start_time)
 
     return wrapper
 
 
+def _new_session(warm_up=None, timeout=None, argument_timeouts=None, live_validation=False, form=None):
+    return argparse.Namespace(interactive=False, values={}, previous_values={}, warm_up=list(warm_up or []),
+                              warm_up_threads=[], warm_up_errors=[], timeout=timeout,
+                              argument_timeouts=dict(argument_timeouts or {}), live_validation=live_validation,
+                              form=form, profiler=None, prompt_time=0)
+
+
+def _add_internal_arguments(parser, **kwargs):
+    for option_string, argument_kwargs in _INTERNAL_ARGUMENTS:
+        with contextlib.suppress(argparse.ArgumentError):
+            parser.add_argument(option_string, **argument_kwargs, **kwargs)
+
+
+def _parse_internal_arguments():
+    config_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_internal_arguments(config_parser)
+    return config_parser.parse_known_args()[0]
+
+
+def _write_profile_report(profile_config, session, wall_time):
+    # note: time spent in interactive prompting is excluded from the cProfile statistics as well as reported separately
+    report = io.StringIO()
+    report.write('\n%s\nTooey profile report\n' % _SEPARATOR)
+    report.write('Total wall time: %.3fs; interactive prompting: %.3fs; script: %.3fs\n' % (
+        wall_time, session.prompt_time, wall_time - session.prompt_time))
+
+    if session.profiler:
+        if profile_config.tooey_profile_output:
+            session.profiler.dump_stats(profile_config.tooey_profile_output)
+            report.write('Full cProfile statistics saved to %s\n' % profile_config.tooey_profile_output)
+        report.write('\n')
+        stats = pstats.Stats(session.profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_PROFILE_REPORT_LINES)
+
+    if tracemalloc.is_tracing():
+        current_memory, peak_memory = tracemalloc.get_traced_memory()
+        report.write('\ntracemalloc: current memory %.1f KiB; peak memory %.1f KiB\n' % (
+            current_memory / 1024, peak_memory / 1024))
+        for statistic in tracemalloc.take_snapshot().statistics('lineno')[:_PROFILE_REPORT_LINES]:
+            report.write('%s\n' % statistic)
+        if profile_config.tooey_trace_memory:
+            tracemalloc.stop()
+
+    report.write('%s\n' % _SEPARATOR)
+    sys.stderr.write(report.getvalue())
+
+
+def _start_warm_up(session):
+    # warm-up tasks (e.g., slow imports or connection setup) run in the background while values are being entered, and
+    # only ever once per session, regardless of how many parsers are used or how many times the function is run
+    tasks, session.warm_up = session.warm_up, []
+    for task in tasks:
+        thread = threading.Thread(target=_run_warm_up_task, args=(task, session.warm_up_errors), daemon=True)
+        thread.start()
+        session.warm_up_threads.append(thread)
+
+
+def _run_warm_up_task(task, errors):
+    try:
+        task()
+    except Exception as e:  # re-raised in the main thread when joining
+        errors.append(e)
+
+
+def _finish_warm_up(session):
+    threads, session.warm_up_threads = session.warm_up_threads, []
+    if any(thread.is_alive() for thread in threads):
+        print('Tooey is waiting for warm-up tasks to complete...')
+    for thread in threads:
+        thread.join()
+    if session.warm_up_errors:
+        raise session.warm_up_errors.pop(0)
+
+
+def _repeat_run(timeout=None):
+    print(_SEPARATOR)
+    try:
+        response = get_input(prompt='Tooey loop mode: enter %s to run again with the previous values pre-filled, or '
+                                    'anything else to exit:' % _YES_CHOICES_STRING, strip=True, timeout=timeout)
+    except (KeyboardInterrupt, EOFError, _PromptTimeout):
+        print()
+        response = None
+    print(_SEPARATOR)
+    return response in _YES_CHOICES
+
+
 def check_environment(ignore_tooey, force_tooey):
     ignore_tooey = os.environ.get('IGNORE_TOOEY') or ignore_tooey
     force_tooey = os.environ.get('FORCE_TOOEY') or force_tooey
@@ -90,6 +342,120 @@ def check_environment(ignore_tooey, force_tooey):
     return ignore_tooey, force_tooey
 
 
+def _json_safe(value):
+    # schemas are stored as JSON, so any values that cannot be represented directly are stored as their repr instead
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    return repr(value)
+
+
+def _type_name(action_type):
+    return action_type.__name__ if hasattr(action_type, '__name__') else str(action_type)
+
+
+def _describe_action(action, group_titles, exclusive_groups):
+    dynamic_choices = isinstance(action.choices, ChoiceProvider)  # these are only evaluated when prompting
+    choices = None
+    if action.choices and not dynamic_choices:
+        choices = [str(c) for c in itertools.islice(action.choices, _SCHEMA_CHOICE_LIMIT + 1)]
+
+    return {
+        'dest': action.dest,
+        'option_strings': list(action.option_strings),
+        'action': type(action).__name__,
+        'type': _type_name(action.type) if action.type else None,
+        'nargs': action.nargs,
+        'choices': choices[:_SCHEMA_CHOICE_LIMIT] if choices else None,
+        'choices_truncated': bool(choices) and len(choices) > _SCHEMA_CHOICE_LIMIT,
+        'dynamic_choices': dynamic_choices,
+        'default': _json_safe(action.default),
+        'const': _json_safe(action.const),
+        'required': action.required,
+        'help': action.help if action.help != argparse.SUPPRESS else None,
+        'group': group_titles.get(id(action)),
+        'exclusive_group': exclusive_groups.get(id(action))
+    }
+
+
+def _compile_prompts(definition):
+    type_string = ' of type `%s`' % definition['type'] if definition['type'] else ''
+    choice_list_string = ''
+    if definition['choices']:
+        choices = definition['choices'] + (['...'] if definition['choices_truncated'] else [])
+        choice_list_string = _choice_list_string(choices)
+    return {
+        'option_string': ', '.join(definition['option_strings']) if definition['option_strings'] else
+        definition['dest'],
+        'type_string': type_string,
+        'choice_list_string': choice_list_string
+    }
+
+
+def _choice_list_string(choices):
+    return ' from `%s`' % ', '.join([str(c) for c in choices])
+
+
+def compile_schema(parser, cache_directory=None):
+    # compile the parser's actions into a serialisable schema of each argument's details and prompt strings (listing at
+    # most `_SCHEMA_CHOICE_LIMIT` choices per argument, so that compiling stays cheap however many choices there are) -
+    # if a cache directory is given (or set via an environment variable) the schema is also written there, keyed by a
+    # hash of its contents, so that external front ends can read it rather than introspecting argparse internals; Tooey
+    # itself never reads these files back (note: we have to use the parser's internal _actions object because there is
+    # no other way to get an action's details)
+    group_titles = {}
+    for group in parser._action_groups:
+        for action in group._group_actions:
+            group_titles.setdefault(id(action), group.title)
+    exclusive_groups = {}
+    for index, group in enumerate(parser._mutually_exclusive_groups):
+        for action in group._group_actions:
+            exclusive_groups.setdefault(id(action), index)
+
+    definitions = [_describe_action(action, group_titles, exclusive_groups) for action in parser._actions]
+    for definition in definitions:
+        definition['prompts'] = _compile_prompts(definition)
+    schema = {'version': _SCHEMA_VERSION, 'key': None, 'prog': parser.prog, 'actions': definitions}
+
+    # the key (a hash of the schema's contents) is only needed when writing the schema to a file
+    cache_directory = cache_directory or os.environ.get(_SCHEMA_CACHE_ENVIRONMENT_VARIABLE)
+    if not cache_directory:
+        return schema
+    schema['key'] = hashlib.sha256(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+    cache_file = os.path.join(cache_directory, '%s.json' % schema['key'])
+    if not os.path.exists(cache_file):  # an existing file already contains this exact schema
+        with contextlib.suppress(OSError):
+            os.makedirs(cache_directory, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as schema_file:
+                json.dump(schema, schema_file)
+    return schema
+
+
+def check_timeout_environment(timeout):
+    with contextlib.suppress(ValueError):
+        timeout = float(os.environ.get(_TIMEOUT_ENVIRONMENT_VARIABLE) or timeout or 0) or None
+    return timeout
+
+
+def _fallback_value(action, current_value, default):
+    # the value to use when no response is given - for `append` actions, keep any values added so far
+    if type(action) in (_AppendAction, _AppendConstAction) and current_value:
+        return current_value
+    if type(action) is _AppendConstAction and action.required:
+        return [action.const]
+    return default
+
+
+def _copy_value(value):
+    try:
+        return copy.deepcopy(value)
+    except (TypeError, copy.Error):  # e.g., open files from `argparse.FileType` arguments
+        return value
+
+
 def safe_get_namespace_boolean(namespaces, key):
     for namespace in namespaces:  # for when we don't know if a store_true argument is actually present
         if key in namespace.__dict__:
@@ -99,6 +465,7 @@ def safe_get_namespace_boolean(namespaces, key):
 
 def parse_args(self, args=None, namespace=None):
     self.tooey_original_error_message = None
+    self.tooey_error_messages = []
     if hasattr(self, 'tooey_global_config') and self.tooey_global_config:
         self.tooey_config = copy.deepcopy(self.tooey_global_config)
     else:
@@ -107,9 +474,7 @@ def parse_args(self, args=None, namespace=None):
     if 'gooey' not in sys.modules or args is not None:
         # called on a specified list rather than sys.argv - note: if Gooey supported this (which it currently doesn't),
         # calling in this way would show up in the Gooey UI - perhaps not fixable until Gooey is patched?
-        with contextlib.suppress(argparse.ArgumentError):
-            self.add_argument('--ignore-tooey', action='store_true', help=argparse.SUPPRESS)
-            self.add_argument('--force-tooey', action='store_true', help=argparse.SUPPRESS)
+        _add_internal_arguments(self, help=argparse.SUPPRESS)
 
     parsed_args = self.tooey_original_parse_args(args, namespace)
 
@@ -119,22 +484,43 @@ def parse_args(self, args=None, namespace=None):
         safe_get_namespace_boolean([self.tooey_config, parsed_args], 'force_tooey'))
 
     if 'gooey' not in sys.modules or args is not None:
-        internal_args = ('ignore_tooey', 'force_tooey')
+        internal_args = _INTERNAL_ARGUMENT_DESTS
         for arg in internal_args:
             if arg in parsed_args.__dict__:
                 del parsed_args.__dict__[arg]  # TODO: if these weren't defined by us, they'll now be missing...
-        self._actions = [a for a in self._actions if a.dest not in internal_args]
+        _remove_internal_actions(self, internal_args)
 
+    session = getattr(self, 'tooey_session', None) or _new_session()
     if (not sys.stdout.isatty() or self.tooey_config.ignore_tooey) and not self.tooey_config.force_tooey:
         if self.tooey_original_error_message:
             self.tooey_original_error(self.tooey_original_error_message)
+        _start_warm_up(session)  # there is nothing to overlap with, but the script may still depend on these tasks
+        _finish_warm_up(session)
         return parsed_args
 
     print(_SEPARATOR)
     print('Tooey interactive mode starting - presenting script options')
 
+    prompt_start_time = time.perf_counter()
+    if session.profiler:
+        session.profiler.disable()  # only the script itself is profiled, not the time spent waiting for input
+    session.interactive = True
+    session_timeout = check_timeout_environment(session.timeout)
+    live_validation = bool(os.environ.get(_LIVE_VALIDATION_ENVIRONMENT_VARIABLE) or session.live_validation)
+    form_mode = os.environ.get(_FORM_ENVIRONMENT_VARIABLE) or session.form
+    if form_mode and form_mode != _FORM_GROUP_MODE:
+        form_mode = 'parser'
+    _start_warm_up(session)
+    prefilled_dests = set()
+
     try:
-        # we have to use the parser's internal _actions object because there is no other way to get an action's details
+        # we work from a compiled schema of the parser's actions rather than rebuilding their details for each prompt
+        schema = compile_schema(self)
+        prompts = {id(action): definition['prompts'] for action, definition in zip(self._actions, schema['actions'])}
+        groups = {id(action): definition['group'] for action, definition in zip(self._actions, schema['actions'])}
+        truncated_choices = {id(action) for action, definition in zip(self._actions, schema['actions']) if
+                             definition['choices_truncated']}
+
         # first, save the initial values to check what _was_ provided at runtime, skipping help and version actions
         # because they don't require input, and doing this step separately to option parsing itself because multiple
         # options can share the same `dest`, so the original value could have been updated before we get to it
@@ -149,28 +535,126 @@ def parse_args(self, args=None, namespace=None):
                 #  suppressed - best to drop back to standard argparse if any of these arguments are found?
                 print('\nTooey warning: action type', action_type.__name__, 'is not currently handled - skipping')
 
+        # next, pre-seed values that were not provided at runtime from environment variables or configuration files
+        preset_dests = _apply_presets(self, parsed_args, [a for a in self._actions if type(a) not in ignored_actions and
+                                                          initial_values[a.dest] in (a.default, [])])
+
+        def is_pending(pending_action):  # i.e., whether the action will be prompted for (as in the loop below)
+            if pending_action.dest in preset_dests:
+                return False
+            if type(pending_action) is _AppendConstAction or pending_action.dest in session.previous_values:
+                return True
+            return initial_values[pending_action.dest] in (pending_action.default, [])
+
+        # before prompting, report any problems that are already known, rather than only at the end (or on interruption)
+        supported_actions = [a for a in self._actions if type(a) not in ignored_actions]
+        pending_required = _preflight_check(self, parsed_args, [a for a in supported_actions if is_pending(a)],
+                                            session.previous_values)
+        if not pending_required and _is_required_arguments_error(self.tooey_original_error_message):
+            self.tooey_original_error_message = None  # e.g., addressed by pre-seeded values
+
+        # in form mode, all pending arguments (or those in each argument group) are requested at once
+        shown_forms = set()
+        form_answers = {}
+
         # then, iterate over the available options, gathering any additions via user input
-        for action in filter(lambda a: type(a) not in ignored_actions, self._actions):
+        for action in supported_actions:
+
+            if form_mode and is_pending(action):
+                form_key = groups[id(action)] if form_mode == _FORM_GROUP_MODE else None
+                if form_key not in shown_forms:
+                    shown_forms.add(form_key)
+                    form_actions = {}  # one field per `dest` - i.e., the first action, as with pre-filled values
+                    for form_action in supported_actions:
+                        if is_pending(form_action) and (form_key is None or groups[id(form_action)] == form_key):
+                            form_actions.setdefault(form_action.dest, form_action)
+                    form_answers.update(_get_form_answers(
+                        list(form_actions.values()), prompts, session.previous_values, form_key, session_timeout))
 
-            option_string = ', '.join(action.option_strings) if action.option_strings else action.dest
-            current_value = parsed_args.__dict__[action.dest]
+            action_prompts = prompts[id(action)]
+            # a copy, as (like argparse itself) we must not modify the action's default - e.g., by appending to its list
+            current_value = _copy_value(parsed_args.__dict__[action.dest])
 
             print()
-            print('Argument:', option_string, '(required)' if action.required else '')
+            print('Argument:', action_prompts['option_string'], '(required)' if action.required else '')
             print('Help text:', action.help)
 
-            if initial_values[action.dest] not in (action.default, []) and type(action) is not _AppendConstAction:
+            if action.dest in preset_dests:
+                print('Skipping interactive mode for argument provided via %s (value: %s)' % (
+                    preset_dests[action.dest], current_value))
+                continue
+
+            # in loop mode, values from the previous run are pre-filled by using them as the default value (but only
+            # once per `dest`; later actions sharing the same `dest` build on its current value as normal)
+            default = action.default
+            prefilled = False
+            if action.dest in session.previous_values and action.dest not in prefilled_dests and \
+                    type(action) is not _AppendConstAction:
+                prefilled_dests.add(action.dest)
+                prefilled = True
+                default = _copy_value(session.previous_values[action.dest])
+                current_value = None  # any new `append` values replace (rather than add to) the pre-filled list
+
+            elif initial_values[action.dest] not in (action.default, []) and type(action) is not _AppendConstAction:
                 # note: currently all `append_const` actions are shown even if some are provided at runtime
                 # we don't exclude these because the intent may be to provide them multiple times
                 print('Skipping interactive mode for argument provided at runtime (value: %s)' % current_value)
                 continue
 
-            parsed_args.__dict__[action.dest] = _parse_action(action, current_value)
+            if form_mode:
+                if action.dest in form_answers:
+                    _queued_responses.extend(_get_form_responses(action, form_answers.pop(action.dest)))
+                elif not action.required:  # unanswered optional fields are left as they are
+                    parsed_args.__dict__[action.dest] = _fallback_value(action, current_value, default)
+                    print('Outcome:', action.dest, 'is `%s`' % parsed_args.__dict__[action.dest])
+                    continue
+
+            if id(action) in truncated_choices:  # the full list of choices is only built when it is actually needed
+                action_prompts = dict(action_prompts, choice_list_string=_choice_list_string(action.choices))
+
+            timeout = session.argument_timeouts.get(action.dest, session_timeout)
+            original_value = _copy_value(current_value)
+            action_required = action.required
+            while True:
+                timed_out = False
+                try:
+                    if prefilled and default is not None and type(action) in (_StoreAction, _AppendAction):
+                        action.required = False  # the pre-filled value satisfies the requirement if it is kept
+                    parsed_args.__dict__[action.dest] = _parse_action(action, current_value, action_prompts, default,
+                                                                      timeout=timeout, live_validation=live_validation)
+                except _PromptTimeout as e:
+                    timed_out = True
+                    fallback = _fallback_value(action, current_value if e.partial_value is None else e.partial_value,
+                                               default)
+                    print()
+                    if action.required and fallback is None:
+                        self.tooey_original_error('argument %s: no value was entered within %s seconds' % (
+                            action_prompts['option_string'], timeout))
+                    print('No response was entered within %s seconds - continuing with `%s`' % (timeout, fallback))
+                    parsed_args.__dict__[action.dest] = fallback
+                finally:
+                    action.required = action_required
+                _queued_responses.clear()  # any form values that were not used
+
+                # re-check just the constraints that this value affects, so that problems are reported immediately
+                conflict = _get_exclusive_conflict(self, action, parsed_args)
+                if not conflict:
+                    break
+                if timed_out:
+                    self.tooey_original_error(conflict)
+                print('%s - please enter a different value, or leave blank to skip' % conflict)
+                current_value = _copy_value(original_value)
+
+            pending_required.discard(action.dest)
+            if not pending_required and _is_required_arguments_error(self.tooey_original_error_message):
+                self.tooey_original_error_message = None  # the original error has now been addressed
             print('Outcome:', action.dest, 'is `%s`' % parsed_args.__dict__[action.dest])
 
         print('\nTooey interactive mode completed - continuing script')
         print(_SEPARATOR)
 
+        _finish_warm_up(session)
+        session.values.update({dest: _copy_value(value) for dest, value in parsed_args.__dict__.items()})
         return parsed_args
 
     except KeyboardInterrupt:
@@ -179,21 +663,476 @@ def parse_args(self, args=None, namespace=None):
         if self.tooey_original_error_message:
             # TODO: continue script execution instead if inputs so far have addressed the original error?
             self.tooey_original_error(self.tooey_original_error_message)
+        _finish_warm_up(session)
+
+    finally:
+        session.prompt_time += time.perf_counter() - prompt_start_time
+        if session.profiler:
+            session.profiler.enable()
 
 
-def get_input(prompt='', strip=False):
-    print(prompt, end=' ')
-    response = input()
+def _preflight_check(parser, namespace, pending_actions, previous_values):
+    # returns the `dest` values of required arguments that still need to be entered (i.e., excluding any that have been
+    # pre-filled with a value from the previous run in loop mode)
+    problems = []
+    stopped_parsing = any(_is_argument_error(m) for m in parser.tooey_error_messages)
+    for message in parser.tooey_error_messages:
+        if _is_required_arguments_error(message):
+            continue  # these are listed separately below
+        if stopped_parsing and _is_unrecognized_arguments_error(message):
+            continue  # after our `error` returns, argparse reports all of the unparsed arguments as unrecognised
+        problems.append('The arguments provided at runtime are not valid: %s' % message)
+    if stopped_parsing:
+        problems.append('Note: argparse stops parsing after an invalid argument, so some or all of the values provided '
+                        'at runtime have been ignored, and will be requested below')
+
+    for group in parser._mutually_exclusive_groups:
+        provided = [a for a in group._group_actions if a not in pending_actions and _has_value(a, namespace)]
+        if len(provided) > 1:
+            problems.append('argument %s: not allowed with argument %s' % (
+                argparse._get_action_name(provided[-1]), argparse._get_action_name(provided[0])))
+
+    pending_required = {}
+    for action in pending_actions:
+        if action.required and type(action) not in (_StoreConstAction, _StoreTrueAction, _StoreFalseAction) and \
+                previous_values.get(action.dest) is None:
+            pending_required.setdefault(action.dest, argparse._get_action_name(action))
+    if pending_required:
+        problems.append('Required arguments that need to be entered: %s' % ', '.join(pending_required.values()))
+
+    if problems:
+        print('\nTooey preflight check:')
+        for problem in problems:
+            print('  -', problem)
+    return set(pending_required)
+
+
+def _has_value(action, namespace):
+    value = namespace.__dict__.get(action.dest)
+    return value is not None and value != action.default and value != []
+
+
+def _get_exclusive_conflict(parser, action, namespace):
+    # checks only the mutually exclusive groups that `action` is part of, returning argparse's error message if needed
+    if not _has_value(action, namespace):
+        return None
+    for group in parser._mutually_exclusive_groups:
+        if action in group._group_actions:
+            for other_action in group._group_actions:
+                if other_action.dest != action.dest and _has_value(other_action, namespace):
+                    return 'argument %s: not allowed with argument %s' % (argparse._get_action_name(action),
+                                                                          argparse._get_action_name(other_action))
+    return None
+
+
+def _is_error_message(message, message_format):
+    # note: argparse's messages are translatable, so we compare with the (possibly translated) original
+    return bool(message) and message.startswith(argparse._(message_format).split('%')[0])
+
+
+def _is_required_arguments_error(message):
+    return _is_error_message(message, 'the following arguments are required: %s')
+
+
+def _is_argument_error(message):
+    # i.e., an `ArgumentError` (such as an invalid value), after which argparse stops parsing - unlike, for example,
+    # unrecognised arguments, which are reported after all other values have been parsed
+    return _is_error_message(message, 'argument %(argument_name)s: %(message)s')
+
+
+def _is_unrecognized_arguments_error(message):
+    return _is_error_message(message, 'unrecognized arguments: %s')
+
+
+def _get_form_answers(actions, prompts, previous_values, group_title, timeout=None):
+    # the whole form is written at once, and its values can then be pasted in a single block (one line per value)
+    lines = ['', 'Tooey form entry: %s' % ('arguments in group `%s`' % group_title if group_title else 'all arguments')]
+    form_keys = {}
+    form_actions = {action.dest: action for action in actions}
+    for number, action in enumerate(actions, 1):
+        default = previous_values.get(action.dest, action.default)
+        lines.append('  %d. %s%s - %s' % (number, action.dest, ' (required)' if action.required else '',
+                                         action.help if action.help else prompts[id(action)]['option_string']))
+        lines.append('     enter %s (default: `%s`)' % (_describe_form_field(action, prompts[id(action)]), default))
+        form_keys.update({key: action.dest for key in [str(number), action.dest] + action.option_strings})
+    lines.append('Enter one `name=value` (or `number=value`) line per value, then an empty line to finish - optional '
+                 'arguments that are not entered will keep their default values')
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+    answers = {}
+    while True:
+        try:
+            line = get_input(prompt='>', strip=True, timeout=timeout)
+        except _PromptTimeout:
+            print()
+            break
+        if not line:
+            break
+        key, separator, value = line.partition('=')
+        dest = form_keys.get(key.strip())
+        if not dest or (not separator and not _has_optional_const(form_actions[dest])):
+            print('Unable to match `%s` to an argument - please enter `name=value` or `number=value`' % line)
+            continue
+        if not separator:
+            answers.setdefault(dest, []).append(None)  # the constant value, as when given at runtime with no value
+        elif not value.strip() and type(form_actions[dest]) is _StoreAction and \
+                form_actions[dest].nargs == argparse.OPTIONAL:
+            answers.pop(dest, None)  # an empty optional value keeps the default, as for fields that are not entered
+        else:
+            answers.setdefault(dest, []).append(value.strip())
+    return answers
+
+
+def _describe_form_field(action, prompts):
+    action_type = type(action)
+    if action_type in (_StoreConstAction, _StoreTrueAction, _StoreFalseAction):
+        return '%s to set to `%s`' % (_YES_CHOICES_STRING, action.const if action_type is _StoreConstAction else
+                                      not action.default)
+    if action_type is _AppendConstAction:
+        return '%s to append `%s`' % (_YES_CHOICES_STRING, action.const)
+    if action_type is _CountAction:
+        return 'the number of times to provide this argument'
+    description = 'a value%s' % (prompts['choice_list_string'] or prompts['type_string'])
+    if type(action.nargs) is int or action.nargs in (argparse.ZERO_OR_MORE, argparse.ONE_OR_MORE):
+        description += ' (%s values, separated by spaces)' % (action.nargs if type(action.nargs) is int else 'multiple')
+    if action_type is _AppendAction:
+        description += ' (repeat this line to add more values)'
+    if _has_optional_const(action):
+        description += ' (or just the name, without `=`, to use `%s`)' % action.const
+    return description
+
+
+def _has_optional_const(action):
+    return type(action) is _StoreAction and action.nargs == argparse.OPTIONAL and action.const is not None
+
+
+def _get_form_responses(action, values):
+    # convert form values to the sequence of responses that the action's prompts would expect if entered individually
+    action_type = type(action)
+    list_nargs = type(action.nargs) is int or action.nargs in (argparse.ZERO_OR_MORE, argparse.ONE_OR_MORE)
+    terminated = action.nargs in (argparse.ZERO_OR_MORE, argparse.ONE_OR_MORE)  # i.e., ended by an empty response
+    if action_type in (_AppendAction, _AppendConstAction):
+        responses = []
+        for value in values:
+            split_values = _split_form_value(value) if list_nargs else [value]
+            if not _check_form_value_count(action, value, split_values):
+                return []
+            responses.extend(split_values)
+            if terminated:
+                responses.append('')
+        return responses + ['']
+    if list_nargs:
+        split_values = _split_form_value(values[-1])
+        if not _check_form_value_count(action, values[-1], split_values):
+            return []
+        return split_values + ([''] if terminated else [])
+    if values[-1] is None:  # i.e., the responses that choose the constant value of a `nargs='?'` argument
+        return ['', _YES_CHOICES[0]]
+    return [values[-1]]  # single-value fields use the last value entered
+
+
+def _check_form_value_count(action, value, split_values):
+    # values are queued as individual responses, so any extra values would be silently ignored rather than reported
+    if type(action) in (_StoreAction, _AppendAction) and type(action.nargs) is int and \
+            len(split_values) != action.nargs:
+        print('The response entered for %s (`%s`) does not contain the required number of values (%d) - please enter '
+              'it again below' % (action.dest, value, action.nargs))
+        return False
+    return True
+
+
+def _split_form_value(value):
+    try:
+        return shlex.split(value)
+    except ValueError:  # e.g., unbalanced quotes
+        return value.split()
+
+
+def _remove_internal_actions(parser, internal_args):
+    # fully remove our own arguments so that the parser is left as it was defined (and can be parsed again)
+    for action in [a for a in parser._actions if a.dest in internal_args]:
+        parser._remove_action(action)
+        for group in parser._action_groups:
+            if action in group._group_actions:
+                group._group_actions.remove(action)
+        for option_string in action.option_strings:
+            parser._option_string_actions.pop(option_string, None)
+
+
+def _get_config_file(path):
+    # configuration files are parsed once, and then only re-read if they are modified
+    try:
+        modified_time = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _config_cache.get(path)
+    if cached and cached[0] == modified_time:
+        return cached[1]
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.optionxform = str  # argument `dest` values are case-sensitive
+    try:
+        config.read(path, encoding='utf-8')
+    except configparser.Error as e:
+        print('\nTooey warning: unable to read configuration file', path, '-', e)
+        config = None
+    _config_cache[path] = (modified_time, config)
+    return config
+
+
+def _get_presets(parser):
+    # environment variables take priority over the project configuration file, which in turn takes priority over the
+    # user-level file - in configuration files, values can be set for a specific script in a section named after its
+    # `prog` value, or for all scripts in the `[DEFAULT]` section
+    presets = [('environment variable', {k[len(_PRESET_ENVIRONMENT_VARIABLE_PREFIX):]: v for k, v in
+                                         os.environ.items() if k.startswith(_PRESET_ENVIRONMENT_VARIABLE_PREFIX)})]
+    for path in (os.path.abspath(_PRESET_PROJECT_CONFIG_FILE), os.path.expanduser(_PRESET_USER_CONFIG_FILE)):
+        config = _get_config_file(path)
+        if config:
+            presets.append((path, config[parser.prog] if config.has_section(parser.prog) else config.defaults()))
+    return presets
+
+
+def _apply_presets(parser, namespace, actions):
+    preset_dests = {}
+    presets = _get_presets(parser)
+    for action in actions:
+        if action.dest in preset_dests:
+            continue  # only the first action for any given `dest` is pre-seeded
+        for source, values in presets:
+            key = action.dest.upper() if source == 'environment variable' else action.dest
+            if key not in values:
+                continue
+            if source == 'environment variable':
+                source = '%s %s%s' % (source, _PRESET_ENVIRONMENT_VARIABLE_PREFIX, key)
+            try:
+                _apply_preset(parser, action, values[key], namespace)
+                preset_dests[action.dest] = source
+            except (argparse.ArgumentError, ValueError) as e:
+                print('\nTooey warning: ignoring invalid value for', action.dest, 'from', source, '-', e)
+            break
+    return preset_dests
+
+
+def _apply_preset(parser, action, value, namespace):
+    # values are converted and validated in the same way as if they had been provided on the command line
+    if type(action) is _CountAction:
+        setattr(namespace, action.dest, int(value))
+    elif action.nargs == 0:  # store_const, store_true, store_false and append_const are enabled by a boolean value
+        if value.lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+            raise ValueError('`%s` is not a boolean value' % value)
+        if configparser.ConfigParser.BOOLEAN_STATES[value.lower()]:
+            action(parser, namespace, None)
+    elif action.nargs in (None, argparse.OPTIONAL):
+        values = shlex.split(value) if type(action) is _AppendAction else [value]  # `append` can add several values
+        for single_value in values:
+            action(parser, namespace, parser._get_values(action, [single_value]))
+    else:
+        values = shlex.split(value)
+        if (type(action.nargs) is int and len(values) != action.nargs) or (action.nargs == argparse.ONE_OR_MORE and
+                                                                           not values):
+            raise ValueError('`%s` does not contain the required number of values' % value)
+        action(parser, namespace, parser._get_values(action, values))
+
+
+def get_input(prompt='', strip=False, timeout=None, validator=None):
+    queued = bool(_queued_responses)
+    if queued:  # e.g., from form mode - note that invalid values clear the queue so they are prompted for as normal
+        print(prompt, end=' ')
+        response = _queued_responses.popleft()
+    elif validator and termios and _pending_input is None and sys.stdin.isatty():
+        print(prompt)
+        response = _get_live_input(validator, timeout)
+    elif timeout is None and _pending_input is None:
+        print(prompt, end=' ')
+        with _unbuffered_stdin():
+            response = input()
+    else:
+        print(prompt, end=' ')
+        response = _get_timed_input(timeout)
     if not response:  # testing can produce an actual `None` where real input would only lead to an empty string
         response = ''
     if strip:
         response = response.strip()
-    if 'unittest' in sys.modules:
+    if 'unittest' in sys.modules or queued:
         print(response)  # it is useful to be able to see the actual input when testing
     return response
 
 
-def _parse_action(action, current_value):
+def _get_live_validator(action):
+    # returns a function that checks (partial) input as it is typed, returning whether it is valid, and a hint to show
+    live_type = action.type is None or action.type in _LIVE_VALIDATION_TYPES  # others are only checked on submission
+
+    def validate(text, complete=False):
+        if not text:
+            return True, ''
+        if text == _MORE_CHOICES_COMMAND and isinstance(action.choices, ChoiceProvider):
+            return True, 'show more choices'
+
+        value = text
+        if action.type and live_type:
+            try:
+                value = action.type(text)
+            except ValueError:
+                prefix = _LIVE_VALIDATION_PREFIXES.get(action.type)
+                if not complete and prefix and prefix.fullmatch(text):
+                    return True, 'incomplete `%s` value' % _type_name(action.type)  # i.e., not highlighted as invalid
+                return False, 'not a valid `%s` value' % _type_name(action.type)
+
+        if action.choices and live_type:
+            choices = action.choices.get_choices() if isinstance(action.choices, ChoiceProvider) else action.choices
+            matches = []
+            for choice in itertools.islice(choices, _LIVE_VALIDATION_CHOICE_LIMIT):
+                if str(choice).startswith(text):
+                    matches.append(str(choice))
+                    if len(matches) > _LIVE_VALIDATION_MATCHES:
+                        break
+            hint = ('matches: %s' % ', '.join(matches[:_LIVE_VALIDATION_MATCHES]) + (
+                ', ...' if len(matches) > _LIVE_VALIDATION_MATCHES else '')) if matches else 'no matching choices'
+            return value in choices, hint
+        return True, ''
+
+    return validate
+
+
+def _get_live_input(validator, timeout=None):
+    # a minimal line editor that validates each keystroke - the current input is highlighted when invalid, and cannot be
+    # submitted until it is valid (or empty)
+    input_file = sys.stdin.fileno()
+    original_attributes = termios.tcgetattr(input_file)
+    decoder = codecs.getincrementaldecoder(sys.stdin.encoding or 'utf-8')(errors='replace')
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    text = ''
+    try:
+        tty.setcbreak(input_file, termios.TCSANOW)  # unlike raw mode, Ctrl+C (KeyboardInterrupt) still works
+        _draw_live_input(text, validator)
+        while True:
+            if deadline is not None:
+                ready, _, _ = select.select([input_file], [], [], max(0.0, deadline - time.monotonic()))
+                if not ready:
+                    print()
+                    raise _PromptTimeout(timeout)
+
+            for character in decoder.decode(os.read(input_file, 64)):
+                if character in ('\r', '\n'):
+                    if not text or validator(text, complete=True)[0]:
+                        _draw_live_input(text, None)
+                        print()
+                        return text
+                    sys.stdout.write('\a')  # invalid input cannot be submitted
+                elif character in ('\x7f', '\b'):
+                    text = text[:-1]
+                elif character == '\x15':  # Ctrl+U
+                    text = ''
+                elif character == '\x04' and not text:  # Ctrl+D
+                    print()
+                    raise EOFError
+                elif character == '\x1b':  # ignore escape sequences (e.g., arrow keys)
+                    break
+                elif character.isprintable():
+                    text += character
+            _draw_live_input(text, validator)
+    finally:
+        termios.tcsetattr(input_file, termios.TCSADRAIN, original_attributes)
+
+
+def _draw_live_input(text, validator):
+    valid, hint = validator(text) if validator else (True, '')
+    width = shutil.get_terminal_size().columns - 1
+    line = '> %s' % text
+    hint = ('  (%s)' % hint)[:max(0, width - len(line))] if hint else ''
+    sys.stdout.write('\r\x1b[K%s%s\x1b[0m\x1b[2m%s\x1b[0m' % ('' if valid else '\x1b[31m', line[:width], hint))
+    if hint:
+        sys.stdout.write('\x1b[%dD' % len(hint))  # return the cursor to the end of the input
+    sys.stdout.flush()
+
+
+def _get_timed_input(timeout):
+    global _pending_input
+    sys.stdout.flush()
+    input_file = _get_input_file_descriptor() if termios and _pending_input is None else None
+    if input_file is not None:
+        return _get_selected_input(input_file, timeout)
+
+    # elsewhere (i.e., on Windows), `input()` cannot be interrupted, so a read that times out is left running, and its
+    # result (i.e., whatever the user eventually enters) is used for the next prompt rather than starting a competing
+    # read - note: this read is still running after `parse_args` returns, so it will take the next line of input that
+    # the script itself would otherwise receive
+    if _pending_input is None:
+        _pending_input = argparse.Namespace(completed=threading.Event(), response=None, error=None)
+        threading.Thread(target=_read_pending_input, args=(_pending_input,), daemon=True).start()
+    if not _pending_input.completed.wait(timeout):
+        raise _PromptTimeout(timeout)
+    pending_input, _pending_input = _pending_input, None
+    if pending_input.error:
+        raise pending_input.error
+    return pending_input.response
+
+
+def _get_input_file_descriptor():
+    try:
+        return sys.stdin.fileno()
+    except (AttributeError, OSError, ValueError):  # e.g., when replaced by a test runner
+        return None
+
+
+def _get_selected_input(input_file, timeout):
+    # wait for input with `select` so that nothing is left reading from stdin after a timeout, then read the line in the
+    # same way as untimed prompts do (see `_unbuffered_stdin`)
+    ready, _, _ = select.select([input_file], [], [], timeout)
+    if not ready:
+        raise _PromptTimeout(timeout)
+    line = _LineReader(input_file, sys.stdin.encoding).readline()
+    if not line:
+        raise EOFError
+    return line[:-1] if line.endswith('\n') else line
+
+
+class _LineReader(object):
+    # a minimal stand-in for `sys.stdin` that reads one byte at a time, so that no input beyond the current line is
+    # consumed (and is still available to later prompts, and to the script itself)
+    def __init__(self, input_file, encoding=None):
+        self.input_file = input_file
+        self.encoding = encoding or 'utf-8'
+
+    def fileno(self):
+        return self.input_file
+
+    def readline(self):
+        line = b''
+        while not line.endswith(b'\n'):
+            character = os.read(self.input_file, 1)
+            if not character:
+                break
+            line += character
+        return line.decode(self.encoding, errors='replace')
+
+
+@contextlib.contextmanager
+def _unbuffered_stdin():
+    # when stdin is not a terminal, `input()` reads via `sys.stdin.readline()`, which buffers ahead of the current line,
+    # so that the data would no longer be visible to `select` in timed prompts - we read through `_LineReader` instead
+    input_file = _get_input_file_descriptor() if termios else None
+    if input_file is None or os.isatty(input_file):
+        yield
+        return
+    original_stdin, sys.stdin = sys.stdin, _LineReader(input_file, sys.stdin.encoding)
+    try:
+        yield
+    finally:
+        sys.stdin = original_stdin
+
+
+def _read_pending_input(pending_input):
+    try:
+        pending_input.response = input()
+    except (EOFError, OSError) as e:
+        pending_input.error = e
+    pending_input.completed.set()
+
+
+def _parse_action(action, current_value, prompts, default, timeout=None, live_validation=False):
     action_type = type(action)
 
     if action_type in (_StoreConstAction, _StoreTrueAction, _StoreFalseAction):
@@ -202,16 +1141,27 @@ def _parse_action(action, current_value):
         if action.required:
             print('Skipping interactive mode for required action - the only possible value is `%s`' % yes_response)
             return yes_response
+        if default == yes_response and action.default != yes_response:
+            # pre-filled with the constant value (in loop mode) - the only alternative is the original default
+            response = get_input(prompt='Enter %s to reset to the original default value (`%s`), or anything else to '
+                                        'keep the current value (`%s`):' % (_NO_CHOICES_STRING, action.default,
+                                                                             default), strip=True, timeout=timeout)
+            return action.default if response in _NO_CHOICES else default
         response = get_input(prompt='Enter %s to set to `%s`, or anything else to accept the default value (`%s`):' % (
-            _YES_CHOICES_STRING, yes_response, action.default), strip=True)
-        return yes_response if response in _YES_CHOICES else action.default
+            _YES_CHOICES_STRING, yes_response, default), strip=True, timeout=timeout)
+        return yes_response if response in _YES_CHOICES else default
 
     elif action_type is _AppendConstAction:
         # this action type appends a constant value each time it is provided
         new_value = current_value if current_value else []
         while True:
-            response = get_input(prompt='Enter %s to append `%s` to the current value of `%s`, or anything else to '
-                                        'skip:' % (_YES_CHOICES_STRING, action.const, new_value), strip=True)
+            try:
+                response = get_input(prompt='Enter %s to append `%s` to the current value of `%s`, or anything else '
+                                            'to skip:' % (_YES_CHOICES_STRING, action.const, new_value), strip=True,
+                                     timeout=timeout)
+            except _PromptTimeout as e:
+                e.partial_value = new_value
+                raise
             if response in _YES_CHOICES:
                 new_value.extend([action.const])
             else:
@@ -222,59 +1172,79 @@ def _parse_action(action, current_value):
 
     elif action_type is _AppendAction:
         # this action is like the default, but can be called repeatedly, adding to a single list
-        new_value = _parse_store_action(action)
+        # note: individual values have no default - the default (if any) applies to the list as a whole
+        new_value = _parse_store_action(action, prompts, None, timeout=timeout, live_validation=live_validation)
         action_required = action.required
-        while new_value:
-            if current_value is None:
-                current_value = [new_value]
-            else:
-                current_value.append(new_value)
-            print('Current outcome:', action.dest, 'is `%s`' % current_value)
-            action.required = False  # once we have one result, additional ones are always optional
-            new_value = _parse_store_action(action, append=True)
-        action.required = action_required
-        return current_value if current_value else action.default
+        try:
+            while new_value:
+                if current_value is None:
+                    current_value = [new_value]
+                else:
+                    current_value.append(new_value)
+                print('Current outcome:', action.dest, 'is `%s`' % current_value)
+                action.required = False  # once we have one result, additional ones are always optional
+                new_value = _parse_store_action(action, prompts, None, append=True, timeout=timeout,
+                                                    live_validation=live_validation)
+        except _PromptTimeout as e:
+            e.partial_value = current_value
+            raise
+        finally:
+            action.required = action_required
+        return current_value if current_value else default
 
     elif action_type is _CountAction:
         # this action provides the number of times the same argument occurs
         while True:
             count_response = get_input(prompt='Enter the number of times you would like to provide this argument, or '
-                                              'leave blank to accept the default value (`%s`):' % action.default,
-                                       strip=True)
+                                              'leave blank to accept the default value (`%s`):' % default,
+                                       strip=True, timeout=timeout)
             if count_response.isdigit():
                 return int(count_response)
             elif not count_response:
-                return action.default
+                return default
 
     elif action_type is _StoreAction:
         # the default action type is able to handle one or more arguments flexibly
-        return _parse_store_action(action)
+        return _parse_store_action(action, prompts, default, timeout=timeout, live_validation=live_validation)
 
 
-def _parse_store_action(action, append=False):
+def _parse_store_action(action, prompts, default, append=False, timeout=None, live_validation=False):
     new_value = []
     arg_num = 0
-    type_string = ' of type `%s`' % (
-        action.type.__name__ if hasattr(action.type, '__name__') else action.type) if action.type else ''
-    choice_list_string = (' from `%s`' % ', '.join([str(c) for c in action.choices])) if action.choices else ''
+    type_string = prompts['type_string']
+    choice_list_string = prompts['choice_list_string']
+    choice_page = 0
+    if isinstance(action.choices, ChoiceProvider):
+        choice_list_string = _dynamic_choice_list_string(action.choices, choice_page)
     argument_required_string = 'This argument is required but has not been provided - please enter a value'
+    validator = _get_live_validator(action) if live_validation else None
     while True:
         while True:
-            response = get_input(prompt='Enter %s%s%s for this argument, or leave blank to skip:' % (
+            blank_string = 'skip' if default is None or action.required or len(new_value) > 0 else \
+                'accept the default value (`%s`)' % (default,)
+            response = get_input(prompt='Enter %s%s%s for this argument, or leave blank to %s:' % (
                 'an additional value' if append else 'a value',
                 choice_list_string if choice_list_string else type_string if type_string else '',
-                (' to append to the current value `%s`' % new_value) if len(new_value) > 0 else ''), strip=False)
+                (' to append to the current value `%s`' % new_value) if len(new_value) > 0 else '', blank_string),
+                strip=False, timeout=timeout, validator=validator)
             if response:
+                if response == _MORE_CHOICES_COMMAND and isinstance(action.choices, ChoiceProvider) and \
+                        response not in action.choices:
+                    choice_page += 1
+                    choice_list_string = _dynamic_choice_list_string(action.choices, choice_page)
+                    continue
                 if action.type:
                     try:
                         response = action.type(response)
                     except ValueError:
                         print('The response entered (`%s`) is not of the required type - please enter a value of type '
-                              '`%s`' % (response, action.type.__name__))
+                              '`%s`' % (response, _type_name(action.type)))
+                        _queued_responses.clear()
                         continue
                 if action.choices and response not in action.choices:
                     print('The response entered (`%s`) is not in the list of choices - please enter a value%s' % (
                         response, choice_list_string))
+                    _queued_responses.clear()
                     continue
                 new_value.append(response)
                 arg_num += 1
@@ -287,13 +1257,13 @@ def _parse_store_action(action, append=False):
             if action.required:
                 print(argument_required_string)
                 continue
-            return action.default
+            return default
 
         if type(action.nargs) is int:
             # a specified number of arguments
             if len(new_value) < action.nargs:
                 if not action.required and not response:
-                    return action.default
+                    return default
                 print('This argument requires', action.nargs, 'values;', len(new_value), 'have been provided so far',
                       '- please enter another value')
                 continue
@@ -310,30 +1280,42 @@ def _parse_store_action(action, append=False):
                     response = get_input(prompt='This argument has a constant value (`%s`) - enter %s to choose this, '
                                                 'leave blank to accept the default (`%s`), or enter anything else to '
                                                 'return to the previous prompt:' % (
-                                                    action.const, _YES_CHOICES_STRING, action.default), strip=True)
+                                                    action.const, _YES_CHOICES_STRING, default), strip=True,
+                                         timeout=timeout)
                     if response in _YES_CHOICES:
                         return action.const
                     elif response:
                         continue
-                return action.default
+                return default
             return response
 
         if action.nargs == '*':
             # a list of arguments (no minimum)
             if response:
                 continue
-            return new_value if new_value else action.default
+            return new_value if new_value else default
 
         if action.nargs == '+':
             # a list of arguments (minimum of one if provided as a positional argument)
             if response:
                 continue
-            if not action.option_strings and len(new_value) < 1:
+            if action.required and len(new_value) < 1:
                 print(argument_required_string)
                 continue
-            return new_value if new_value else action.default
+            return new_value if new_value else default
+
+
+def _dynamic_choice_list_string(choice_provider, page):
+    choices, start, total = choice_provider.get_page(page)
+    choice_list_string = _choice_list_string(choices)
+    if total > len(choices):
+        choice_list_string += ' (showing %d-%d of %d; enter `%s` to see more)' % (
+            start + 1, start + len(choices), total, _MORE_CHOICES_COMMAND)
+    return choice_list_string
 
 
 # ArgumentParser's exit_on_error argument was added in Python 3.9; we support below this so override rather than catch
 def error(self, message):
     self.tooey_original_error_message = message  # to be used on failure/cancellation
+    # argparse can continue after an error (and then report another), so we also keep all messages for preflight checks
+    self.tooey_error_messages = getattr(self, 'tooey_error_messages', []) + [message]